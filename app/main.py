@@ -9,7 +9,8 @@ from app.models.schemas import (
     TrainingRequest,
     TrainingResponse,
     HealthResponse,
-    StatsResponse
+    StatsResponse,
+    DriftResponse
 )
 from app.services.ml_service import MLService
 from app.services.data_service import DataService
@@ -93,14 +94,18 @@ async def predict_demand_batch(requests: List[PredictionRequest]):
     """
     try:
         results = []
-        for request in requests:
-            prediction = ml_service.predict(request.dict())
+        records = [request.dict() for request in requests]
+        for record in records:
+            prediction = ml_service.predict(record, track_drift=False)
             results.append({
                 "success": True,
                 "prediction": prediction,
                 "confidence": ml_service.get_confidence_score(),
                 "message": "Predicción realizada exitosamente"
             })
+        
+        # Actualizar sketches de drift con todo el batch en una sola pasada
+        ml_service.track_features(records)
         return results
     except Exception as e:
         raise HTTPException(
@@ -116,11 +121,13 @@ async def train_model(request: TrainingRequest):
     
     - **data_path**: Ruta al archivo CSV con datos de entrenamiento
     - **test_size**: Porcentaje de datos para testing (0.0-1.0)
+    - **preprocess_steps**: Pasos de preprocesamiento a aplicar (por defecto todos)
     """
     try:
         metrics = ml_service.train_model(
             data_path=request.data_path,
-            test_size=request.test_size
+            test_size=request.test_size,
+            preprocess_steps=request.preprocess_steps
         )
         
         return {
@@ -154,6 +161,26 @@ async def get_statistics():
         )
 
 
+@app.get("/api/v1/drift", response_model=DriftResponse)
+async def get_drift():
+    """
+    Obtiene scores de drift (PSI/KS) de las features del tráfico en vivo
+    contra el baseline guardado con el modelo
+    """
+    try:
+        drift = ml_service.get_drift_report()
+        return {
+            "success": True,
+            "drift": drift,
+            "message": "Reporte de drift obtenido exitosamente"
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener reporte de drift: {str(e)}"
+        )
+
+
 @app.get("/api/v1/model/info")
 async def get_model_info():
     """
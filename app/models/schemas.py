@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Literal
 
 
 class PredictionRequest(BaseModel):
@@ -46,12 +46,17 @@ class TrainingRequest(BaseModel):
     """Schema para solicitud de entrenamiento"""
     data_path: str = Field(default="data/training_data.csv", description="Ruta al archivo de datos")
     test_size: float = Field(default=0.2, description="Porcentaje de datos para testing", ge=0.1, le=0.5)
+    preprocess_steps: Optional[List[Literal['deduplicate', 'fill_missing', 'remove_outliers']]] = Field(
+        default=None,
+        description="Pasos de preprocesamiento: deduplicate, fill_missing, remove_outliers (por defecto todos)"
+    )
     
     class Config:
         json_schema_extra = {
             "example": {
                 "data_path": "data/training_data.csv",
-                "test_size": 0.2
+                "test_size": 0.2,
+                "preprocess_steps": ["deduplicate", "fill_missing", "remove_outliers"]
             }
         }
 
@@ -103,3 +108,30 @@ class StatsResponse(BaseModel):
             }
         }
 
+
+class DriftResponse(BaseModel):
+    """Schema para respuesta de monitoreo de drift"""
+    success: bool
+    drift: Dict[str, Any]
+    message: str
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "success": True,
+                "drift": {
+                    "baseline_loaded": True,
+                    "baseline_records": 8000,
+                    "live_records": 250,
+                    "features": {
+                        "price": {
+                            "live_count": 250,
+                            "psi": 0.04,
+                            "ks": 0.07,
+                            "drift_level": "stable"
+                        }
+                    }
+                },
+                "message": "Reporte de drift obtenido exitosamente"
+            }
+        }
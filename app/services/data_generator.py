@@ -0,0 +1,254 @@
+import os
+import numpy as np
+import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SUPPORTED_FORMATS = ('csv', 'parquet')
+
+# Catálogo compartido por proceso, se inicializa una vez por worker
+_worker_catalog: Optional[Dict[str, np.ndarray]] = None
+
+
+def build_catalog(n_products: int = 100, seed: int = 42, start_product_id: int = 100) -> Dict[str, np.ndarray]:
+    """
+    Genera el catálogo de productos con parámetros propios por producto
+
+    Args:
+        n_products: Cantidad de productos en el catálogo
+        seed: Semilla para reproducibilidad
+        start_product_id: Primer ID de producto
+
+    Returns:
+        Diccionario de arrays (uno por parámetro) indexados por producto
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(0,)))
+
+    # Popularidad tipo Zipf: pocos productos concentran la mayor parte de las ventas
+    ranks = rng.permutation(n_products) + 1
+    popularity = 1.0 / ranks ** 1.1
+
+    return {
+        'product_id': np.arange(start_product_id, start_product_id + n_products, dtype=np.int32),
+        'popularity': popularity / popularity.sum(),
+        'base_demand': rng.uniform(60, 140, n_products),
+        'base_price': rng.uniform(15, 90, n_products),
+        'elasticity': rng.uniform(0.2, 0.8, n_products),
+        'promotion_lift': rng.uniform(30, 70, n_products),
+        'promotion_rate': rng.uniform(0.15, 0.45, n_products),
+        # Estacionalidad anual: amplitud y mes pico por producto
+        'season_amplitude': rng.uniform(0, 40, n_products),
+        'season_peak': rng.integers(1, 13, n_products),
+    }
+
+
+def generate_shard(catalog: Dict[str, np.ndarray], n_rows: int, seed: int, shard_index: int) -> pd.DataFrame:
+    """
+    Genera un shard de datos de forma vectorizada
+
+    El generador aleatorio depende solo de (seed, shard_index), por lo que
+    el shard es idéntico sin importar qué proceso lo genere.
+
+    Args:
+        catalog: Catálogo generado con build_catalog
+        n_rows: Cantidad de filas del shard
+        seed: Semilla global
+        shard_index: Índice del shard
+
+    Returns:
+        DataFrame con las features y la demanda
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(1, shard_index)))
+
+    product = rng.choice(len(catalog['product_id']), size=n_rows, p=catalog['popularity'])
+    month = rng.integers(1, 13, n_rows, dtype=np.int8)
+    day_of_week = rng.integers(0, 7, n_rows, dtype=np.int8)
+    price = (catalog['base_price'][product] * rng.uniform(0.8, 1.2, n_rows)).round(2)
+    promotion = (rng.random(n_rows) < catalog['promotion_rate'][product]).astype(np.int8)
+    stock = rng.integers(50, 500, n_rows, dtype=np.int32)
+
+    # La demanda disminuye cuando el precio supera el precio base del producto
+    price_effect = -catalog['elasticity'][product] * (price - catalog['base_price'][product])
+
+    # La demanda es mayor en fin de semana
+    weekend_effect = np.where(day_of_week >= 5, 30, 0)
+
+    season_effect = catalog['season_amplitude'][product] * np.cos(
+        2 * np.pi * (month - catalog['season_peak'][product]) / 12
+    )
+
+    # Stock bajo puede limitar la demanda
+    stock_effect = np.minimum(stock * 0.3, 50)
+
+    demand = (
+        catalog['base_demand'][product] +
+        promotion * catalog['promotion_lift'][product] +
+        price_effect +
+        weekend_effect +
+        season_effect +
+        stock_effect +
+        rng.normal(0, 15, n_rows)
+    )
+
+    return pd.DataFrame({
+        'product_id': catalog['product_id'][product],
+        'month': month,
+        'day_of_week': day_of_week,
+        'price': price,
+        'promotion': promotion,
+        'stock': stock,
+        'demand': np.clip(demand, 10, None).round(0).astype(np.int32),
+    })
+
+
+def _init_worker(catalog: Dict[str, np.ndarray]):
+    """Guarda el catálogo en el proceso para no serializarlo en cada tarea"""
+    global _worker_catalog
+    _worker_catalog = catalog
+
+
+def _render_shard(args: tuple):
+    """
+    Genera un shard y lo serializa para escribirlo (ejecutado en workers)
+
+    Retorna los bytes CSV (con encabezado solo en el primer shard) o una
+    tabla de Arrow, para que el proceso principal solo tenga que anexarlo.
+    """
+    n_rows, seed, shard_index, file_format = args
+
+    df = generate_shard(_worker_catalog, n_rows, seed, shard_index)
+    if file_format == 'parquet':
+        import pyarrow as pa
+        return pa.Table.from_pandas(df, preserve_index=False)
+    return df.to_csv(index=False, header=shard_index == 0).encode()
+
+
+class _ShardWriter:
+    """Anexa shards en orden a un único archivo CSV o Parquet"""
+
+    def __init__(self, output_path: str, file_format: str):
+        self.output_path = output_path
+        self.file_format = file_format
+        self._file = None
+        self._parquet_writer = None
+        if file_format == 'csv':
+            self._file = open(output_path, 'wb')
+
+    def write(self, shard):
+        """Anexa un shard generado por _render_shard"""
+        if self.file_format == 'parquet':
+            if self._parquet_writer is None:
+                import pyarrow.parquet as pq
+                self._parquet_writer = pq.ParquetWriter(self.output_path, shard.schema)
+            self._parquet_writer.write_table(shard)
+        else:
+            self._file.write(shard)
+
+    def close(self):
+        """Cierra el archivo de salida"""
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        if self._file is not None:
+            self._file.close()
+
+
+def generate_dataset(
+    n_samples: int,
+    output_path: str = "data/training_data.csv",
+    file_format: Optional[str] = None,
+    workers: int = 1,
+    shard_size: int = 1_000_000,
+    seed: int = 42,
+    n_products: int = 100,
+    start_product_id: int = 100
+) -> Dict[str, Any]:
+    """
+    Genera un dataset sintético en shards paralelos y lo escribe incrementalmente
+
+    Los workers generan y serializan los shards; el proceso principal los
+    anexa al archivo de salida en orden a medida que llegan, con a lo sumo
+    2 * workers shards en vuelo. No se escriben archivos intermedios.
+
+    El resultado depende solo de seed, shard_size y el catálogo; la cantidad
+    de workers no cambia los datos generados.
+
+    Args:
+        n_samples: Cantidad total de filas
+        output_path: Ruta del archivo de salida
+        file_format: 'csv' o 'parquet' (por defecto se infiere de la extensión)
+        workers: Cantidad de procesos
+        shard_size: Filas por shard
+        seed: Semilla para reproducibilidad
+        n_products: Cantidad de productos en el catálogo
+        start_product_id: Primer ID de producto
+
+    Returns:
+        Diccionario con el resumen de la generación
+    """
+    if file_format is None:
+        file_format = 'parquet' if output_path.endswith('.parquet') else 'csv'
+    if file_format not in SUPPORTED_FORMATS:
+        raise ValueError(f"Formato no soportado: {file_format}. Opciones: {SUPPORTED_FORMATS}")
+    if file_format == 'parquet':
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("El formato parquet requiere pyarrow: pip install pyarrow")
+    if n_samples <= 0 or shard_size <= 0:
+        raise ValueError("n_samples y shard_size deben ser mayores a 0")
+
+    catalog = build_catalog(n_products, seed, start_product_id)
+
+    n_shards = (n_samples + shard_size - 1) // shard_size
+    shard_rows = [min(shard_size, n_samples - i * shard_size) for i in range(n_shards)]
+
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    logger.info(
+        f"Generando {n_samples} muestras en {n_shards} shards "
+        f"con {workers} workers ({file_format})..."
+    )
+
+    tasks = [
+        (n_rows, seed, shard_index, file_format)
+        for shard_index, n_rows in enumerate(shard_rows)
+    ]
+
+    writer = _ShardWriter(output_path, file_format)
+    try:
+        if workers > 1 and n_shards > 1:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(catalog,)
+            ) as executor:
+                # Ventana acotada de shards en vuelo, escritos en orden al completarse
+                pending = deque()
+                for task in tasks:
+                    pending.append(executor.submit(_render_shard, task))
+                    if len(pending) >= 2 * workers:
+                        writer.write(pending.popleft().result())
+                while pending:
+                    writer.write(pending.popleft().result())
+        else:
+            _init_worker(catalog)
+            for task in tasks:
+                writer.write(_render_shard(task))
+    finally:
+        writer.close()
+
+    logger.info(f"Datos guardados en {output_path}")
+
+    return {
+        'output_path': output_path,
+        'format': file_format,
+        'total_records': n_samples,
+        'shards': n_shards,
+        'products': n_products,
+        'seed': seed,
+    }
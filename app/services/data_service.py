@@ -1,8 +1,13 @@
+import time
+import tracemalloc
+from contextlib import contextmanager
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import logging
 
+from app.services.data_generator import generate_dataset
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -10,8 +15,12 @@ logger = logging.getLogger(__name__)
 class DataService:
     """Servicio para procesamiento y análisis de datos"""
     
+    PREPROCESS_STEPS = ('deduplicate', 'fill_missing', 'remove_outliers')
+    QUANTILE_SAMPLE_SIZE = 200_000
+    
     def __init__(self):
         self.data: pd.DataFrame = None
+        self.last_preprocess_metrics: Dict[str, float] = {}
         
     def load_data(self, file_path: str) -> pd.DataFrame:
         """
@@ -36,6 +45,10 @@ class DataService:
         """
         Genera datos de ejemplo para entrenamiento
         
+        Usa el mismo generador que scripts/generate_data.py
+        (app.services.data_generator); para volúmenes grandes usar el
+        script, que genera en paralelo sin cargar los datos en memoria.
+        
         Args:
             n_samples: Número de muestras a generar
             output_path: Ruta donde guardar el CSV
@@ -43,62 +56,8 @@ class DataService:
         Returns:
             DataFrame con datos generados
         """
-        np.random.seed(42)
-        
-        logger.info(f"Generando {n_samples} muestras de datos...")
-        
-        # Generar features
-        data = {
-            'product_id': np.random.randint(100, 200, n_samples),
-            'month': np.random.randint(1, 13, n_samples),
-            'day_of_week': np.random.randint(0, 7, n_samples),
-            'price': np.random.uniform(10, 100, n_samples).round(2),
-            'promotion': np.random.choice([0, 1], n_samples, p=[0.7, 0.3]),
-            'stock': np.random.randint(50, 500, n_samples),
-        }
-        
-        df = pd.DataFrame(data)
-        
-        # Generar demanda basada en features (con relaciones lógicas)
-        base_demand = 100
-        
-        # La demanda aumenta con promociones
-        promotion_effect = df['promotion'] * 50
-        
-        # La demanda disminuye con precio alto
-        price_effect = -0.5 * df['price']
-        
-        # La demanda es mayor en fin de semana
-        weekend_effect = np.where(df['day_of_week'].isin([5, 6]), 30, 0)
-        
-        # La demanda es mayor en diciembre (temporada)
-        season_effect = np.where(df['month'] == 12, 50, 0)
-        
-        # Stock bajo puede limitar la demanda
-        stock_effect = np.minimum(df['stock'] * 0.3, 50)
-        
-        # Calcular demanda con algo de ruido
-        df['demand'] = (
-            base_demand + 
-            promotion_effect + 
-            price_effect + 
-            weekend_effect + 
-            season_effect + 
-            stock_effect + 
-            np.random.normal(0, 15, n_samples)
-        )
-        
-        # Asegurar que la demanda sea positiva
-        df['demand'] = df['demand'].clip(lower=10).round(0).astype(int)
-        
-        # Guardar datos
-        import os
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        df.to_csv(output_path, index=False)
-        logger.info(f"Datos guardados en {output_path}")
-        
-        self.data = df
-        return df
+        generate_dataset(n_samples=n_samples, output_path=output_path, file_format='csv', seed=42)
+        return self.load_data(output_path)
         
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -149,37 +108,159 @@ class DataService:
             
         return stats
         
-    def preprocess_data(self, df: pd.DataFrame) -> pd.DataFrame:
+    def preprocess_data(
+        self,
+        df: pd.DataFrame,
+        steps: Optional[List[str]] = None,
+        lower_quantile: float = 0.01,
+        upper_quantile: float = 0.99,
+        chunk_size: int = 1_000_000
+    ) -> pd.DataFrame:
         """
-        Preprocesa datos para el modelo
+        Preprocesa datos para el modelo en una etapa fusionada
+        
+        Un único recorrido por chunks calcula el hash de cada fila y los
+        nulos por columna. Los duplicados se detectan sobre los hashes
+        (8 bytes por fila), los nulos de columnas float se rellenan in place
+        sobre el array de la columna (con Copy-on-Write de pandas activo se
+        reemplaza la columna) y los cuantiles de outliers se estiman sobre
+        una muestra. El DataFrame se copia a lo sumo una vez, al aplicar el
+        filtro final. El tiempo y la memoria de cada paso quedan en
+        last_preprocess_metrics.
         
         Args:
-            df: DataFrame a preprocesar
-            
+            df: DataFrame a preprocesar (se modifica in place al rellenar nulos)
+            steps: Pasos a aplicar (por defecto PREPROCESS_STEPS)
+            lower_quantile: Cuantil inferior para outliers de demanda
+            upper_quantile: Cuantil superior para outliers de demanda
+            chunk_size: Filas por chunk en el recorrido de los datos
+        
         Returns:
             DataFrame preprocesado
         """
-        logger.info("Preprocesando datos...")
+        steps = list(self.PREPROCESS_STEPS if steps is None else steps)
+        unknown = [step for step in steps if step not in self.PREPROCESS_STEPS]
+        if unknown:
+            raise ValueError(f"Pasos de preprocesamiento desconocidos: {unknown}. Opciones: {self.PREPROCESS_STEPS}")
+        
+        logger.info(f"Preprocesando datos ({', '.join(steps) or 'sin pasos'})...")
+        
+        metrics: Dict[str, float] = {'preprocess_rows_in': len(df)}
+        n_rows = len(df)
+        keep = np.ones(n_rows, dtype=bool)
         
-        # Crear copia
-        df_processed = df.copy()
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        
+        try:
+            # Recorrido único: hash de filas y conteo de nulos por columna
+            with self._measure_step('scan', metrics, not tracing):
+                hashes = np.empty(n_rows, dtype=np.uint64) if 'deduplicate' in steps else None
+                null_counts = pd.Series(0, index=df.columns)
+                count_nulls = 'fill_missing' in steps
+                for start in range(0, n_rows, chunk_size):
+                    chunk = df.iloc[start:start + chunk_size]
+                    if hashes is not None:
+                        hashes[start:start + len(chunk)] = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+                    if count_nulls:
+                        null_counts += chunk.isna().sum()
         
-        # Eliminar duplicados
-        df_processed = df_processed.drop_duplicates()
+            if 'deduplicate' in steps:
+                with self._measure_step('deduplicate', metrics, not tracing):
+                    keep &= ~pd.Series(hashes, copy=False).duplicated(keep='first').to_numpy()
+                    del hashes
         
-        # Manejar valores nulos (si existen)
-        df_processed = df_processed.fillna(df_processed.mean(numeric_only=True))
+            # Rellenar nulos con la media de las filas no duplicadas
+            if 'fill_missing' in steps:
+                with self._measure_step('fill_missing', metrics, not tracing):
+                    for column in null_counts.index[null_counts > 0]:
+                        # Solo columnas float de numpy (las numéricas con nulos de read_csv)
+                        if not (isinstance(df[column].dtype, np.dtype) and df[column].dtype.kind == 'f'):
+                            continue
+                        values = df[column].to_numpy()
+                        nulls = np.isnan(values)
+                        valid = np.count_nonzero(~nulls & keep)
+                        if valid == 0:
+                            continue
+                        mean = np.nansum(values, where=keep) / valid
+                        if values.flags.writeable:
+                            values[nulls] = mean
+                        else:
+                            # Con Copy-on-Write la columna es de solo lectura
+                            df[column] = df[column].fillna(mean)
         
-        # Eliminar outliers extremos (opcional)
-        if 'demand' in df_processed.columns:
-            q1 = df_processed['demand'].quantile(0.01)
-            q99 = df_processed['demand'].quantile(0.99)
-            df_processed = df_processed[
-                (df_processed['demand'] >= q1) & 
-                (df_processed['demand'] <= q99)
-            ]
+            # Eliminar outliers extremos con cuantiles aproximados
+            if 'remove_outliers' in steps and 'demand' in df.columns and keep.any():
+                with self._measure_step('remove_outliers', metrics, not tracing):
+                    demand = df['demand'].to_numpy()
+                    sample = self._sample_kept(demand, keep)
+                    q_low, q_high = np.nanquantile(sample, [lower_quantile, upper_quantile])
+                    for start in range(0, n_rows, chunk_size):
+                        chunk = demand[start:start + chunk_size]
+                        keep[start:start + chunk_size] &= (chunk >= q_low) & (chunk <= q_high)
+                    metrics['preprocess_demand_q_low'] = float(q_low)
+                    metrics['preprocess_demand_q_high'] = float(q_high)
+        
+            with self._measure_step('filter', metrics, not tracing):
+                df_processed = df if keep.all() else df[keep]
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+        
+        metrics['preprocess_rows_out'] = len(df_processed)
+        self.last_preprocess_metrics = metrics
         
         logger.info(f"Datos preprocesados: {len(df_processed)} registros")
         
         return df_processed
-
+        
+    def _sample_kept(self, values: np.ndarray, keep: np.ndarray) -> np.ndarray:
+        """
+        Muestra de las filas marcadas en keep, de a lo sumo QUANTILE_SAMPLE_SIZE
+        
+        Si hay pocas filas se toman todas. Si no, se sortean posiciones sobre
+        todo el array en lotes acotados y se descartan las no marcadas, sin
+        construir un índice del tamaño de los datos.
+        """
+        n_kept = int(np.count_nonzero(keep))
+        if n_kept <= self.QUANTILE_SAMPLE_SIZE:
+            return values[keep]
+        
+        rng = np.random.default_rng(42)
+        acceptance = n_kept / len(values)
+        samples = []
+        collected = 0
+        while collected < self.QUANTILE_SAMPLE_SIZE:
+            missing = self.QUANTILE_SAMPLE_SIZE - collected
+            # Sobremuestreo del 10% según la proporción de filas conservadas
+            batch = min(int(missing / acceptance * 1.1) + 1, 4 * self.QUANTILE_SAMPLE_SIZE)
+            positions = rng.integers(0, len(values), batch)
+            positions = positions[keep[positions]][:missing]
+            samples.append(values[positions])
+            collected += len(positions)
+        return np.concatenate(samples)
+        
+    @staticmethod
+    @contextmanager
+    def _measure_step(step: str, metrics: Dict[str, float], owns_tracing: bool):
+        """
+        Registra el tiempo y el pico de memoria de un paso de preprocesamiento
+        
+        Si tracemalloc ya estaba activo antes de preprocess_data, el pico no
+        se reinicia (lo puede estar midiendo otro código): se reporta lo que
+        subió el pico global durante el paso, o en su defecto el aumento neto
+        de memoria, que es una cota inferior del pico del paso.
+        """
+        if owns_tracing:
+            tracemalloc.reset_peak()
+        memory_start, peak_start = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        yield
+        metrics[f'preprocess_{step}_seconds'] = time.perf_counter() - start
+        memory_end, peak_end = tracemalloc.get_traced_memory()
+        if owns_tracing or peak_end > peak_start:
+            step_peak = peak_end - memory_start
+        else:
+            step_peak = memory_end - memory_start
+        metrics[f'preprocess_{step}_peak_mb'] = max(step_peak, 0) / 1024 ** 2
@@ -0,0 +1,446 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class FeatureSketch:
+    """
+    Sketch de memoria fija para una feature: histograma con bordes fijos
+    más contadores de momentos (count, sum, sumsq, min, max).
+
+    Los bordes se calculan una única vez a partir de los cuantiles del
+    baseline y se usan solo para las comparaciones PSI/KS; los cuantiles
+    se reportan con QuantileSketch.
+    """
+
+    def __init__(self, edges: np.ndarray):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64)
+        self.count = 0
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, n_bins: int = 20) -> "FeatureSketch":
+        """
+        Crea un sketch con bordes por cuantiles y lo llena con los valores
+
+        Args:
+            values: Valores de la feature (baseline)
+            n_bins: Número máximo de bins
+
+        Returns:
+            FeatureSketch con los valores agregados
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            raise ValueError("No se puede crear un sketch sin valores")
+
+        # Features discretas (ej. promotion) producen bordes repetidos
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1]))
+        sketch = cls(edges)
+        sketch.update(values)
+        return sketch
+
+    def update(self, values: np.ndarray):
+        """
+        Agrega valores al sketch (O(1) de memoria, vectorizado)
+
+        Args:
+            values: Array 1D con los valores a agregar
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        idx = np.searchsorted(self.edges, values, side='right')
+        self.counts += np.bincount(idx, minlength=len(self.counts))
+        self.count += len(values)
+        self.sum += float(values.sum())
+        self.sumsq += float(np.dot(values, values))
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def empty_like(self) -> "FeatureSketch":
+        """Retorna un sketch vacío con los mismos bordes"""
+        return FeatureSketch(self.edges)
+
+    def mean(self) -> float:
+        """Media de los valores agregados"""
+        return self.sum / self.count if self.count else 0.0
+
+    def std(self) -> float:
+        """Desviación estándar de los valores agregados"""
+        if self.count == 0:
+            return 0.0
+        variance = self.sumsq / self.count - self.mean() ** 2
+        return float(np.sqrt(max(variance, 0.0)))
+
+    def proportions(self) -> np.ndarray:
+        """Proporción de valores en cada bin"""
+        if self.count == 0:
+            return np.zeros(len(self.counts))
+        return self.counts / self.count
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializa el sketch para guardarlo junto al modelo"""
+        return {
+            'edges': self.edges.tolist(),
+            'counts': self.counts.tolist(),
+            'count': self.count,
+            'sum': self.sum,
+            'sumsq': self.sumsq,
+            'min': self.min,
+            'max': self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FeatureSketch":
+        """Reconstruye un sketch serializado con to_dict"""
+        sketch = cls(np.array(data['edges'], dtype=float))
+        sketch.counts = np.array(data['counts'], dtype=np.int64)
+        sketch.count = int(data['count'])
+        sketch.sum = float(data['sum'])
+        sketch.sumsq = float(data['sumsq'])
+        sketch.min = float(data['min'])
+        sketch.max = float(data['max'])
+        return sketch
+
+
+class _DenseStore:
+    """Conteos por índice logarítmico en un array denso de tamaño acotado"""
+
+    def __init__(self, max_bins: int):
+        self.max_bins = max_bins
+        self.offset = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def add(self, keys: np.ndarray):
+        """Agrega un batch de índices, colapsando los más bajos si se excede max_bins"""
+        if len(keys) == 0:
+            return
+
+        low, high = int(keys.min()), int(keys.max())
+        if len(self.counts):
+            low = min(low, self.offset)
+            high = max(high, self.offset + len(self.counts) - 1)
+        if high - low + 1 > self.max_bins:
+            low = high - self.max_bins + 1
+            keys = np.maximum(keys, low)
+
+        if len(self.counts) == 0 or low != self.offset or high - low + 1 != len(self.counts):
+            self._resize(low, high)
+
+        self.counts += np.bincount(keys - low, minlength=len(self.counts))
+
+    def _resize(self, low: int, high: int):
+        """Reubica los conteos en el rango [low, high], colapsando los índices menores a low"""
+        counts = np.zeros(high - low + 1, dtype=np.int64)
+        if len(self.counts):
+            keys = np.arange(self.offset, self.offset + len(self.counts))
+            positions = np.maximum(keys, low) - low
+            np.add.at(counts, positions, self.counts)
+        self.offset = low
+        self.counts = counts
+
+    def items(self):
+        """Índices y conteos no nulos, en orden ascendente de índice"""
+        nonzero = np.flatnonzero(self.counts)
+        return nonzero + self.offset, self.counts[nonzero]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializa el store"""
+        return {
+            'max_bins': self.max_bins,
+            'offset': self.offset,
+            'counts': self.counts.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "_DenseStore":
+        """Reconstruye un store serializado con to_dict"""
+        store = cls(int(data['max_bins']))
+        store.offset = int(data['offset'])
+        store.counts = np.array(data['counts'], dtype=np.int64)
+        return store
+
+
+class QuantileSketch:
+    """
+    Sketch de cuantiles de memoria fija (DDSketch)
+
+    Cada valor se asigna a un bucket logarítmico, con un error relativo
+    acotado por relative_accuracy, sin depender de un rango definido de
+    antemano. La memoria está acotada por max_bins buckets por signo.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = np.log(self.gamma)
+        # Valores con magnitud menor a este umbral se cuentan como cero
+        self.min_value = 1e-9
+        self.positive = _DenseStore(max_bins)
+        self.negative = _DenseStore(max_bins)
+        self.zero_count = 0
+        self.count = 0
+
+    def _keys(self, magnitudes: np.ndarray) -> np.ndarray:
+        """Índice del bucket logarítmico de cada magnitud"""
+        return np.ceil(np.log(magnitudes) / self.log_gamma).astype(np.int64)
+
+    def _value(self, key: int) -> float:
+        """Valor representativo del bucket (error relativo <= relative_accuracy)"""
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def update(self, values: np.ndarray):
+        """
+        Agrega valores al sketch (vectorizado)
+
+        Args:
+            values: Array 1D con los valores a agregar
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+
+        positive = values[values > self.min_value]
+        negative = values[values < -self.min_value]
+        self.positive.add(self._keys(positive))
+        self.negative.add(self._keys(-negative))
+        self.zero_count += len(values) - len(positive) - len(negative)
+        self.count += len(values)
+
+    def quantile(self, q: float) -> float:
+        """
+        Cuantil aproximado con error relativo acotado
+
+        Args:
+            q: Cuantil (0.0-1.0)
+
+        Returns:
+            Valor aproximado del cuantil
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = q * (self.count - 1)
+
+        # Orden ascendente: negativos (de mayor a menor magnitud), ceros, positivos
+        keys, counts = self.negative.items()
+        cumulative = np.cumsum(counts[::-1])
+        if len(cumulative) and rank < cumulative[-1]:
+            i = int(np.searchsorted(cumulative, rank, side='right'))
+            return -self._value(int(keys[::-1][i]))
+        seen = cumulative[-1] if len(cumulative) else 0
+
+        seen += self.zero_count
+        if rank < seen:
+            return 0.0
+
+        keys, counts = self.positive.items()
+        cumulative = seen + np.cumsum(counts)
+        i = min(int(np.searchsorted(cumulative, rank, side='right')), len(keys) - 1)
+        return self._value(int(keys[i]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializa el sketch para guardarlo junto al modelo"""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'positive': self.positive.to_dict(),
+            'negative': self.negative.to_dict(),
+            'zero_count': self.zero_count,
+            'count': self.count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        """Reconstruye un sketch serializado con to_dict"""
+        sketch = cls(relative_accuracy=float(data['relative_accuracy']))
+        sketch.positive = _DenseStore.from_dict(data['positive'])
+        sketch.negative = _DenseStore.from_dict(data['negative'])
+        sketch.zero_count = int(data['zero_count'])
+        sketch.count = int(data['count'])
+        return sketch
+
+
+class DriftService:
+    """Servicio para monitoreo de drift de features en tráfico en vivo"""
+
+    PSI_EPSILON = 1e-4
+    QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+    def __init__(self, feature_names: List[str], n_bins: int = 20):
+        self.feature_names = feature_names
+        self.n_bins = n_bins
+        self.baseline: Dict[str, FeatureSketch] = {}
+        self.baseline_quantiles: Dict[str, QuantileSketch] = {}
+        self.live: Dict[str, FeatureSketch] = {}
+        self.live_quantiles: Dict[str, QuantileSketch] = {}
+
+    def build_baseline(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Construye el baseline a partir de los datos de entrenamiento
+
+        Args:
+            df: DataFrame con las columnas de feature_names
+
+        Returns:
+            Baseline serializado, listo para guardarse con el modelo
+        """
+        logger.info("Construyendo baseline de distribuciones de features...")
+        self.baseline = {}
+        self.baseline_quantiles = {}
+        for name in self.feature_names:
+            values = df[name].to_numpy()
+            self.baseline[name] = FeatureSketch.from_values(values, self.n_bins)
+            self.baseline_quantiles[name] = QuantileSketch()
+            self.baseline_quantiles[name].update(values)
+        self.reset()
+        return self.get_baseline()
+
+    def get_baseline(self) -> Dict[str, Any]:
+        """Retorna el baseline serializado"""
+        return {
+            name: {
+                'histogram': sketch.to_dict(),
+                'quantiles': self.baseline_quantiles[name].to_dict(),
+            }
+            for name, sketch in self.baseline.items()
+        }
+
+    def set_baseline(self, baseline: Optional[Dict[str, Any]]):
+        """
+        Carga un baseline serializado (ej. desde el archivo del modelo)
+
+        Args:
+            baseline: Baseline generado por build_baseline, o None
+        """
+        baseline = baseline or {}
+        self.baseline = {
+            name: FeatureSketch.from_dict(data['histogram']) for name, data in baseline.items()
+        }
+        self.baseline_quantiles = {
+            name: QuantileSketch.from_dict(data['quantiles']) for name, data in baseline.items()
+        }
+        self.reset()
+
+    def has_baseline(self) -> bool:
+        """Verifica si hay un baseline cargado"""
+        return len(self.baseline) > 0
+
+    def reset(self):
+        """Reinicia los sketches de tráfico en vivo"""
+        self.live = {name: sketch.empty_like() for name, sketch in self.baseline.items()}
+        self.live_quantiles = {name: QuantileSketch() for name in self.baseline}
+
+    def update(self, X: np.ndarray):
+        """
+        Agrega un batch de filas de tráfico en vivo a los sketches
+
+        Args:
+            X: Array 2D (n_filas, n_features) en el orden de feature_names
+        """
+        if not self.has_baseline():
+            return
+
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        for i, name in enumerate(self.feature_names):
+            self.live[name].update(X[:, i])
+            self.live_quantiles[name].update(X[:, i])
+
+    def update_from_records(self, records: List[Dict[str, Any]]):
+        """
+        Agrega filas de tráfico en vivo expresadas como diccionarios
+
+        Args:
+            records: Lista de diccionarios con las features
+        """
+        if not records or not self.has_baseline():
+            return
+
+        X = np.array([[record[name] for name in self.feature_names] for record in records], dtype=float)
+        self.update(X)
+
+    @classmethod
+    def psi(cls, expected: np.ndarray, actual: np.ndarray) -> float:
+        """Population Stability Index entre dos vectores de proporciones"""
+        expected = np.clip(expected, cls.PSI_EPSILON, None)
+        actual = np.clip(actual, cls.PSI_EPSILON, None)
+        return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+    @staticmethod
+    def ks(expected: np.ndarray, actual: np.ndarray) -> float:
+        """Estadístico KS aproximado sobre los bordes de los bins"""
+        return float(np.max(np.abs(np.cumsum(expected) - np.cumsum(actual))))
+
+    @staticmethod
+    def _psi_level(psi: float) -> str:
+        """Clasifica el PSI según los umbrales habituales"""
+        if psi < 0.1:
+            return "stable"
+        if psi < 0.25:
+            return "moderate"
+        return "significant"
+
+    def get_drift_report(self) -> Dict[str, Any]:
+        """
+        Compara el tráfico en vivo contra el baseline del modelo
+
+        Returns:
+            Diccionario con scores PSI/KS y cuantiles por feature
+        """
+        if not self.has_baseline():
+            return {
+                "baseline_loaded": False,
+                "message": "No hay baseline disponible. Entrenar el modelo primero."
+            }
+
+        live_records = min(sketch.count for sketch in self.live.values())
+        features = {}
+        for name in self.feature_names:
+            base = self.baseline[name]
+            live = self.live[name]
+
+            feature_report = {
+                "live_count": live.count,
+                "baseline": {
+                    "mean": base.mean(),
+                    "std": base.std(),
+                    "quantiles": {str(q): self.baseline_quantiles[name].quantile(q) for q in self.QUANTILES},
+                },
+            }
+
+            if live.count > 0:
+                psi = self.psi(base.proportions(), live.proportions())
+                feature_report.update({
+                    "psi": psi,
+                    "ks": self.ks(base.proportions(), live.proportions()),
+                    "drift_level": self._psi_level(psi),
+                    "live": {
+                        "mean": live.mean(),
+                        "std": live.std(),
+                        "quantiles": {str(q): self.live_quantiles[name].quantile(q) for q in self.QUANTILES},
+                    },
+                })
+
+            features[name] = feature_report
+
+        return {
+            "baseline_loaded": True,
+            "baseline_records": min(sketch.count for sketch in self.baseline.values()),
+            "live_records": live_records,
+            "features": features,
+        }
@@ -6,9 +6,12 @@ from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 from sklearn.preprocessing import StandardScaler
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import logging
 
+from app.services.data_service import DataService
+from app.services.drift_service import DriftService
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -22,6 +25,8 @@ class MLService:
         self.scaler: Optional[StandardScaler] = None
         self.feature_names = ['product_id', 'month', 'day_of_week', 'price', 'promotion', 'stock']
         self.last_confidence = 0.0
+        self.drift_service = DriftService(self.feature_names)
+        self.data_service = DataService()
         
         # Intentar cargar modelo existente
         self._load_model()
@@ -33,6 +38,7 @@ class MLService:
                 model_data = joblib.load(self.model_path)
                 self.model = model_data['model']
                 self.scaler = model_data['scaler']
+                self.drift_service.set_baseline(model_data.get('baseline'))
                 logger.info("Modelo cargado exitosamente")
             else:
                 logger.warning("No se encontró modelo pre-entrenado. Entrenar el modelo primero.")
@@ -45,20 +51,27 @@ class MLService:
             os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
             model_data = {
                 'model': self.model,
-                'scaler': self.scaler
+                'scaler': self.scaler,
+                'baseline': self.drift_service.get_baseline()
             }
             joblib.dump(model_data, self.model_path)
             logger.info("Modelo guardado exitosamente")
         except Exception as e:
             logger.error(f"Error al guardar modelo: {str(e)}")
             
-    def train_model(self, data_path: str = "data/training_data.csv", test_size: float = 0.2) -> Dict[str, float]:
+    def train_model(
+        self,
+        data_path: str = "data/training_data.csv",
+        test_size: float = 0.2,
+        preprocess_steps: Optional[List[str]] = None
+    ) -> Dict[str, float]:
         """
         Entrena el modelo con datos proporcionados
         
         Args:
             data_path: Ruta al archivo CSV con datos de entrenamiento
             test_size: Porcentaje de datos para testing
+            preprocess_steps: Pasos de preprocesamiento (por defecto todos, [] para omitir)
             
         Returns:
             Diccionario con métricas del modelo
@@ -73,6 +86,9 @@ class MLService:
             if not all(col in df.columns for col in required_columns):
                 raise ValueError(f"El dataset debe contener las columnas: {required_columns}")
             
+            # Preprocesar (duplicados, nulos y outliers) en una sola etapa
+            df = self.data_service.preprocess_data(df, steps=preprocess_steps)
+            
             # Preparar features y target
             X = df[self.feature_names]
             y = df['demand']
@@ -98,6 +114,9 @@ class MLService:
             )
             self.model.fit(X_train_scaled, y_train)
             
+            # Baseline de distribuciones para monitoreo de drift
+            self.drift_service.build_baseline(X_train)
+            
             # Evaluar modelo
             y_pred = self.model.predict(X_test_scaled)
             
@@ -106,7 +125,8 @@ class MLService:
                 'mae': float(mean_absolute_error(y_test, y_pred)),
                 'rmse': float(np.sqrt(mean_squared_error(y_test, y_pred))),
                 'train_samples': len(X_train),
-                'test_samples': len(X_test)
+                'test_samples': len(X_test),
+                **self.data_service.last_preprocess_metrics
             }
             
             logger.info(f"Modelo entrenado. R² Score: {metrics['r2_score']:.4f}")
@@ -120,12 +140,13 @@ class MLService:
             logger.error(f"Error al entrenar modelo: {str(e)}")
             raise
             
-    def predict(self, features: Dict[str, Any]) -> float:
+    def predict(self, features: Dict[str, Any], track_drift: bool = True) -> float:
         """
         Realiza una predicción de demanda
         
         Args:
             features: Diccionario con las características del producto
+            track_drift: Si se agregan las features al monitoreo de drift
             
         Returns:
             Predicción de demanda
@@ -144,6 +165,9 @@ class MLService:
             # Predecir
             prediction = self.model.predict(X_scaled)[0]
             
+            if track_drift:
+                self.drift_service.update(X)
+            
             # Calcular confianza (simplificado)
             self.last_confidence = min(0.95, max(0.70, float(self.model.score(X_scaled, [prediction]))))
             
@@ -153,6 +177,19 @@ class MLService:
             logger.error(f"Error al realizar predicción: {str(e)}")
             raise
             
+    def track_features(self, records: List[Dict[str, Any]]):
+        """
+        Agrega un batch de features al monitoreo de drift en una sola pasada
+        
+        Args:
+            records: Lista de diccionarios con las características
+        """
+        self.drift_service.update_from_records(records)
+        
+    def get_drift_report(self) -> Dict[str, Any]:
+        """Retorna los scores de drift del tráfico en vivo contra el baseline"""
+        return self.drift_service.get_drift_report()
+        
     def get_confidence_score(self) -> float:
         """Retorna el score de confianza de la última predicción"""
         return self.last_confidence
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Script para generar datos sintéticos de entrenamiento y pruebas de carga
+"""
+
+import sys
+import os
+import argparse
+import time
+
+# Agregar el directorio raíz al path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.data_generator import generate_dataset, SUPPORTED_FORMATS
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos de demanda")
+    parser.add_argument("--n-samples", type=int, default=10000, help="Cantidad total de filas")
+    parser.add_argument("--output", default="data/training_data.csv", help="Archivo de salida")
+    parser.add_argument("--format", choices=SUPPORTED_FORMATS, default=None,
+                        help="Formato de salida (por defecto se infiere de la extensión)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Cantidad de procesos")
+    parser.add_argument("--shard-size", type=int, default=1_000_000,
+                        help="Filas por shard (cambiarlo cambia los datos generados)")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla para reproducibilidad")
+    parser.add_argument("--n-products", type=int, default=100, help="Cantidad de productos en el catálogo")
+    parser.add_argument("--start-product-id", type=int, default=100, help="Primer ID de producto")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    print("=" * 60)
+    print("Generación de Datos de Demanda")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    summary = generate_dataset(
+        n_samples=args.n_samples,
+        output_path=args.output,
+        file_format=args.format,
+        workers=args.workers,
+        shard_size=args.shard_size,
+        seed=args.seed,
+        n_products=args.n_products,
+        start_product_id=args.start_product_id
+    )
+    elapsed = time.perf_counter() - start
+
+    print("\n✓ Datos generados exitosamente!")
+    print(f"  Registros:        {summary['total_records']}")
+    print(f"  Productos:        {summary['products']}")
+    print(f"  Shards:           {summary['shards']}")
+    print(f"  Formato:          {summary['format']}")
+    print(f"  Semilla:          {summary['seed']}")
+    print(f"  Tiempo:           {elapsed:.1f}s")
+
+    print("\n" + "=" * 60)
+    print(f"Datos guardados en: {summary['output_path']}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
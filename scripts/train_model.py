@@ -36,6 +36,14 @@ def main():
     print(f"  Muestras train:   {metrics['train_samples']}")
     print(f"  Muestras test:    {metrics['test_samples']}")
     
+    print("\nPreprocesamiento:")
+    print(f"  Registros:        {metrics['preprocess_rows_in']} -> {metrics['preprocess_rows_out']}")
+    for key, value in metrics.items():
+        if key.startswith('preprocess_') and key.endswith('_seconds'):
+            step = key[len('preprocess_'):-len('_seconds')]
+            peak_mb = metrics[f'preprocess_{step}_peak_mb']
+            print(f"  {step:<17} {value:.3f}s  {peak_mb:.1f} MB")
+    
     print("\n" + "=" * 60)
     print("Modelo guardado en: models/demand_model.pkl")
     print("=" * 60)